@@ -0,0 +1,160 @@
+"""
+Bulk Fetch Planner - Avoiding N+1 Requests
+==========================================
+Used by: part2_status_codes.py
+
+Features:
+- Knows the JSONPlaceholder hierarchy: users -> posts -> comments, users -> todos
+- Fetches a whole child collection once (e.g. /comments) and groups it by parent
+  locally instead of calling /posts/{id}/comments for every post
+- Falls back to concurrent per-parent requests when the bulk call fails
+- Counts how many requests were made and how many were saved
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BASE_URL = "https://jsonplaceholder.typicode.com"
+
+# child collection -> (parent collection, foreign key on the child)
+HIERARCHY = {
+    "posts": ("users", "userId"),
+    "todos": ("users", "userId"),
+    "albums": ("users", "userId"),
+    "comments": ("posts", "postId"),
+    "photos": ("albums", "albumId"),
+}
+
+
+class BulkFetcher:
+    """Plans JSONPlaceholder fetches so reports cost a fixed number of requests."""
+
+    def __init__(self, base_url=BASE_URL, timeout=10, max_workers=8, session=None):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.session = session or requests.Session()
+        self.requests_made = 0
+        self.requests_saved = 0
+        self._count_lock = threading.Lock()
+        self._collections = {}  # "posts" -> [item, ...]
+        self._groups = {}       # "comments" -> {parent_id: [item, ...]}, complete bulk results only
+        self._per_parent = {}   # "comments" -> {parent_id: [item, ...]}, parents fetched one by one
+        self._no_bulk = set()   # collections whose bulk request failed; go straight to per-parent
+
+    # ======================
+    # Raw requests
+    # ======================
+    def _get(self, path):
+        with self._count_lock:
+            self.requests_made += 1
+        response = self.session.get(f"{self.base_url}/{path}", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def collection(self, name):
+        """Fetch a whole collection once, e.g. collection("users")."""
+        if name not in self._collections:
+            self._collections[name] = self._get(name)
+        return self._collections[name]
+
+    # ======================
+    # Planner
+    # ======================
+    def children_by_parent(self, child, parent_ids=None, bulk=True):
+        """
+        Return {parent_id: [child, ...]} for a child collection.
+
+        Parameters:
+            child (str): "posts", "comments", "todos", ...
+            parent_ids (list): parents to cover; defaults to every parent
+            bulk (bool): try one collection request before per-parent requests
+                (only once per collection: after a failure it isn't retried)
+
+        Parents whose per-parent request failed are left out of the result
+        (and fetched again next time) rather than reported as empty.
+        """
+        if child not in HIERARCHY:
+            raise ValueError(f"Unknown collection '{child}'. Known: {', '.join(HIERARCHY)}")
+        parent, key = HIERARCHY[child]
+        made_before = self.requests_made
+        # Without the planner: list the parents (if not given), then one request each.
+        lists_parents = parent_ids is None
+
+        if bulk and child not in self._groups and child not in self._no_bulk:
+            try:
+                self._groups[child] = _group_by(self.collection(child), key)
+            except (requests.RequestException, ValueError) as e:
+                self._no_bulk.add(child)
+                print(f"Bulk fetch of /{child} failed ({e}), falling back to per-{parent[:-1]} requests")
+
+        if parent_ids is None:
+            parent_ids = [item["id"] for item in self.collection(parent)]
+
+        if child in self._groups:
+            groups = self._groups[child]
+            result = {pid: groups.get(pid, []) for pid in parent_ids}
+        else:
+            fetched = self._per_parent.setdefault(child, {})
+            missing = [pid for pid in parent_ids if pid not in fetched]
+            fetched.update(self._fetch_per_parent(parent, child, missing))
+            result = {pid: fetched[pid] for pid in parent_ids if pid in fetched}
+
+        naive = len(parent_ids) + lists_parents
+        self.requests_saved += max(naive - (self.requests_made - made_before), 0)
+        return result
+
+    def _fetch_per_parent(self, parent, child, parent_ids):
+        """Concurrent /{parent}/{id}/{child} requests; failed parents are omitted."""
+        def fetch(pid):
+            try:
+                return pid, self._get(f"{parent}/{pid}/{child}")
+            except (requests.RequestException, ValueError) as e:
+                print(f"Error fetching /{parent}/{pid}/{child}: {e}")
+                return pid, None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return {pid: items for pid, items in pool.map(fetch, parent_ids) if items is not None}
+
+    # ======================
+    # Reports
+    # ======================
+    def comments_per_post(self):
+        """Return {post_id: number of comments} for every post."""
+        groups = self.children_by_parent("comments")
+        return {pid: len(comments) for pid, comments in groups.items()}
+
+    def completed_todos_per_user(self):
+        """Return {user_id: number of completed todos} for every user."""
+        groups = self.children_by_parent("todos")
+        return {uid: sum(1 for t in todos if t["completed"]) for uid, todos in groups.items()}
+
+    def posts_per_user(self):
+        """Return {user_id: number of posts} for every user."""
+        groups = self.children_by_parent("posts")
+        return {uid: len(posts) for uid, posts in groups.items()}
+
+    def report(self):
+        return f"{self.requests_made} requests made, {self.requests_saved} saved"
+
+
+def _group_by(items, key):
+    groups = {}
+    for item in items:
+        groups.setdefault(item[key], []).append(item)
+    return groups
+
+
+if __name__ == "__main__":
+    fetcher = BulkFetcher()
+
+    comments = fetcher.comments_per_post()
+    print(f"Comments on {len(comments)} posts, {sum(comments.values())} in total")
+
+    todos = fetcher.completed_todos_per_user()
+    for user_id, done in todos.items():
+        print(f"  User {user_id}: {done} completed todos")
+
+    print(fetcher.report())
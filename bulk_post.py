@@ -0,0 +1,131 @@
+"""
+Bulk POST Pipeline - Sending Many Records Safely
+================================================
+Used by: part5_real_api.py
+
+Features:
+- Sends an iterable of payloads with a fixed number of requests in flight
+- Reuses pooled connections through one requests.Session
+- Gives every item its own Idempotency-Key so a retried POST can't create duplicates
+- Keeps going when an item fails and records the error for that item
+- Appends each result as one line to a JSONL file as soon as it arrives
+"""
+
+import json
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+POSTS_URL = "https://jsonplaceholder.typicode.com/posts"
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def idempotency_key(payload):
+    """
+    Key for one item, reused for all of that item's retries.
+
+    Uses the payload's own "idempotency_key" if it has one, otherwise a new
+    random key. Two records with identical content still get different keys.
+    Random keys don't survive a rerun of the pipeline: to make reruns safe,
+    give each record a stable "idempotency_key" (e.g. its id in your data).
+    """
+    return str(payload.get("idempotency_key") or uuid.uuid4())
+
+
+def make_session(pool_size):
+    """Session whose connection pool is big enough for every worker."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def post_one(session, url, payload, key, timeout=10, retries=3):
+    """
+    POST a single payload, retrying network errors and 429/5xx responses.
+
+    Returns:
+        dict: {"success": True, "status": code, "data": ...} or
+              {"success": False, "status": code or None, "error": msg}
+    """
+    headers = {"Idempotency-Key": key}
+    status = None
+    error = "Unknown error"
+    for attempt in range(1, retries + 1):
+        try:
+            response = session.post(url, json=payload, headers=headers, timeout=timeout)
+            status = response.status_code
+            if status in RETRY_STATUS and attempt < retries:
+                error = f"HTTP {status}"
+            else:
+                response.raise_for_status()
+                return {"success": True, "status": status, "data": response.json()}
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error = str(e)
+        except (requests.RequestException, ValueError) as e:
+            return {"success": False, "status": status, "error": str(e)}
+        if attempt < retries:
+            time.sleep(0.5 * 2 ** (attempt - 1))
+    return {"success": False, "status": status, "error": error}
+
+
+def bulk_post(payloads, url=POSTS_URL, sink="post_responses.jsonl", max_workers=8,
+              timeout=10, retries=3, session=None):
+    """
+    POST every payload with at most max_workers requests in flight.
+
+    Parameters:
+        payloads (iterable): dicts to send; consumed lazily. An optional
+            "idempotency_key" field is used as the key and not sent.
+        url (str): endpoint shaped like JSONPlaceholder /posts
+        sink (str): JSONL file that each result is appended to
+        max_workers (int): concurrent requests (and pooled connections)
+    Returns:
+        dict: {"sent": n, "succeeded": n, "failed": n, "seconds": t}
+    """
+    session = session or make_session(max_workers)
+    summary = {"sent": 0, "succeeded": 0, "failed": 0}
+    start = time.perf_counter()
+
+    def send(index, payload):
+        key = None
+        try:
+            key = idempotency_key(payload)
+            body = {k: v for k, v in payload.items() if k != "idempotency_key"}
+            result = post_one(session, url, body, key, timeout, retries)
+        except Exception as e:
+            # A bad payload (not a dict, not JSON serializable...) fails only its own item.
+            result = {"success": False, "status": None, "error": f"{type(e).__name__}: {e}"}
+        result.update({"index": index, "idempotency_key": key})
+        return result
+
+    with open(sink, "a") as out, ThreadPoolExecutor(max_workers=max_workers) as pool:
+        def record(done):
+            for future in done:
+                result = future.result()
+                summary["succeeded" if result["success"] else "failed"] += 1
+                out.write(json.dumps(result, separators=(",", ":")) + "\n")
+
+        in_flight = set()
+        for index, payload in enumerate(payloads):
+            # Keep the queue bounded so a huge iterable isn't loaded all at once.
+            if len(in_flight) >= max_workers * 2:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                record(done)
+            in_flight.add(pool.submit(send, index, payload))
+            summary["sent"] += 1
+        record(wait(in_flight).done)
+
+    summary["seconds"] = round(time.perf_counter() - start, 2)
+    return summary
+
+
+if __name__ == "__main__":
+    sample = ({"title": f"Post {i}", "body": "Bulk content", "userId": i % 10 + 1} for i in range(50))
+    result = bulk_post(sample)
+    print(f"Sent {result['sent']} posts in {result['seconds']}s: "
+          f"{result['succeeded']} succeeded, {result['failed']} failed")
@@ -0,0 +1,308 @@
+"""
+Coin Registry - Resolve Coin Names Locally
+==========================================
+Used by: part4_error_handling.py, part5_real_api.py
+
+Features:
+- Builds a registry of every coin from CoinPaprika's /v1/coins list
+- Saves it to a compact local file (coins_registry.json) for the next run
+- Looks coins up by id, symbol or name, plus prefix search
+- Refreshes in a background thread and swaps in a new index only when coins changed
+- Rejects or corrects bad input before any network request is made
+"""
+
+import bisect
+import difflib
+import json
+import os
+import threading
+import time
+
+import requests
+
+COINS_URL = "https://api.coinpaprika.com/v1/coins"
+REGISTRY_FILE = "coins_registry.json"
+REGISTRY_VERSION = 1
+MAX_AGE_SECONDS = 24 * 60 * 60  # refresh the list once a day
+SEARCH_MAX_KEYS = 500   # keys scanned by one prefix search
+SUGGEST_MAX_KEYS = 50   # candidates compared when correcting a typo
+
+
+class CoinIndex:
+    """
+    Lookup tables for one snapshot of the coin list.
+
+    An index is never modified after it is built. Refreshing builds a new one
+    and swaps it in, so readers always see a complete snapshot.
+    """
+
+    def __init__(self, rows=()):
+        self.coins = {}      # id -> (id, symbol, name, rank)
+        self.by_symbol = {}  # "btc" -> ["btc-bitcoin", ...] best rank first
+        self.by_name = {}    # "bitcoin" -> ["btc-bitcoin", ...]
+        self.key_ids = {}    # lookup key -> [coin id, ...] best rank first
+        key_ids = self.key_ids
+        for row in sorted(rows, key=_rank_key):
+            coin_id, symbol, name, rank = row
+            self.coins[coin_id] = row
+            symbol, name = symbol.lower(), name.lower()
+            key_ids.setdefault(coin_id, []).append(coin_id)
+            if symbol:
+                self.by_symbol.setdefault(symbol, []).append(coin_id)
+                if symbol != coin_id:
+                    key_ids.setdefault(symbol, []).append(coin_id)
+            if name:
+                self.by_name.setdefault(name, []).append(coin_id)
+                if name != coin_id and name != symbol:
+                    key_ids.setdefault(name, []).append(coin_id)
+        self.keys = sorted(self.key_ids)  # for prefix search
+
+    def prefix_keys(self, prefix, max_keys):
+        """Return up to max_keys lookup keys starting with prefix."""
+        start = bisect.bisect_left(self.keys, prefix)
+        found = []
+        for key in self.keys[start:start + max_keys]:
+            if not key.startswith(prefix):
+                break
+            found.append(key)
+        return found
+
+
+class CoinRegistry:
+    """In-memory index of CoinPaprika coins backed by a local file."""
+
+    def __init__(self, path=REGISTRY_FILE, aliases=None):
+        self.path = path
+        self.aliases = {k.lower(): v for k, v in (aliases or {}).items()}
+        self.updated = 0
+        self._lock = threading.Lock()  # serializes writers; readers never wait
+        self._refresh_thread = None
+        self._index = CoinIndex()
+
+    def __len__(self):
+        return len(self._index.coins)
+
+    # ======================
+    # Loading & Saving
+    # ======================
+    def load(self):
+        """Load the registry from disk. Returns True if a file was read."""
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if saved.get("version") != REGISTRY_VERSION:
+            return False
+        index = CoinIndex(tuple(row) for row in saved.get("coins", []))
+        with self._lock:
+            self._index = index
+            self.updated = saved.get("updated", 0)
+        return True
+
+    def save(self):
+        """Write the registry as one compact JSON document (atomic replace)."""
+        index = self._index
+        rows = sorted(index.coins.values(), key=_rank_key)
+        saved = {"version": REGISTRY_VERSION, "updated": self.updated, "coins": rows}
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(saved, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def is_stale(self, max_age=MAX_AGE_SECONDS):
+        return time.time() - self.updated > max_age
+
+    # ======================
+    # Refreshing
+    # ======================
+    def refresh(self, timeout=10):
+        """
+        Download the coin list and apply only the differences.
+
+        The new index is built off to the side and swapped in with one
+        assignment, and only when something changed.
+
+        Returns:
+            dict: {"added": n, "updated": n, "removed": n} or None on error
+        """
+        try:
+            response = requests.get(COINS_URL, timeout=timeout)
+            response.raise_for_status()
+            coins = response.json()
+        except (requests.RequestException, ValueError) as e:
+            print(f"Error refreshing coin registry: {e}")
+            return None
+
+        fresh = {}
+        for coin in coins:
+            if not coin.get("is_active", True):
+                continue
+            row = (coin["id"], coin.get("symbol") or "", coin.get("name") or "", coin.get("rank") or 0)
+            fresh[row[0]] = row
+
+        with self._lock:
+            current = self._index.coins
+            stats = {
+                "added": sum(1 for c in fresh if c not in current),
+                "updated": sum(1 for c, row in fresh.items() if c in current and current[c] != row),
+                "removed": sum(1 for c in current if c not in fresh),
+            }
+            if any(stats.values()):
+                self._index = CoinIndex(fresh.values())
+            self.updated = time.time()
+
+        # Always save, so the new timestamp keeps other processes from refreshing again.
+        try:
+            self.save()
+        except OSError as e:
+            print(f"Could not save coin registry: {e}")
+        return stats
+
+    def refresh_in_background(self, max_age=MAX_AGE_SECONDS):
+        """Start a daemon thread to refresh the registry if it is stale."""
+        if not self.is_stale(max_age):
+            return None
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return self._refresh_thread
+        self._refresh_thread = threading.Thread(target=self.refresh, daemon=True)
+        self._refresh_thread.start()
+        return self._refresh_thread
+
+    # ======================
+    # Lookups
+    # ======================
+    # Each lookup reads self._index once, so a refresh can't change it halfway.
+    def get(self, coin_id):
+        """Return {"id", "symbol", "name", "rank"} for a coin id, or None."""
+        row = self._index.coins.get(coin_id)
+        if not row:
+            return None
+        return dict(zip(("id", "symbol", "name", "rank"), row))
+
+    def resolve(self, query):
+        """
+        Turn user input (id, symbol, name or alias) into a coin id.
+
+        Returns:
+            str: the coin id, or None if nothing matches exactly
+        """
+        return self._resolve(self._index, query.lower().strip())
+
+    def _resolve(self, index, key):
+        if not key:
+            return None
+        if key in self.aliases:
+            return self.aliases[key]
+        if key in index.coins:
+            return key
+        ids = index.by_symbol.get(key) or index.by_name.get(key)
+        if ids:
+            return ids[0]
+        return None
+
+    def search(self, prefix, limit=5, max_keys=SEARCH_MAX_KEYS):
+        """Return coin ids whose id, symbol or name starts with prefix."""
+        return self._search(self._index, prefix.lower().strip(), limit, max_keys)
+
+    def _search(self, index, prefix, limit, max_keys=SEARCH_MAX_KEYS):
+        if not prefix:
+            return []
+        found = set()
+        for key in index.prefix_keys(prefix, max_keys):
+            found.update(index.key_ids[key])
+        return [row[0] for row in sorted((index.coins[c] for c in found), key=_rank_key)[:limit]]
+
+    def suggest(self, query, limit=5):
+        """
+        Return likely coin ids for input that did not resolve.
+
+        Only a bounded set of candidates is compared: the keys sharing the
+        longest prefix with the query (at least 2 characters).
+        """
+        return self._suggest(self._index, query.lower().strip(), limit)
+
+    def _suggest(self, index, key, limit):
+        matches = self._search(index, key, limit)
+        if matches:
+            return matches
+        for length in range(len(key) - 1, 1, -1):
+            candidates = index.prefix_keys(key[:length], SUGGEST_MAX_KEYS)
+            if candidates:
+                break
+        else:
+            return []
+        close = difflib.get_close_matches(key, candidates, n=limit, cutoff=0.6)
+        suggestions = []
+        for match in close:
+            coin_id = index.key_ids[match][0]
+            if coin_id not in suggestions:
+                suggestions.append(coin_id)
+        return suggestions
+
+    def check(self, query):
+        """
+        Validate user input without touching the network.
+
+        Returns:
+            dict: {"valid": True, "id": coin_id} or
+                  {"valid": False, "suggestions": [coin_id, ...]}
+        """
+        index = self._index
+        key = query.lower().strip()
+        coin_id = self._resolve(index, key)
+        if coin_id:
+            return {"valid": True, "id": coin_id}
+        if not index.coins:
+            # Nothing downloaded yet, so we can't reject anything.
+            return {"valid": True, "id": key}
+        return {"valid": False, "suggestions": self._suggest(index, key, 5)}
+
+
+def _rank_key(row):
+    # Unranked coins (rank 0) go to the end.
+    rank = row[3]
+    return (rank == 0, rank, row[0])
+
+
+# ======================
+# Shared registry
+# ======================
+_registry = None
+
+
+def get_registry(aliases=None):
+    """
+    Return the shared registry, loading it from disk on first use.
+
+    With no saved file yet, the first download blocks: a background thread
+    would be killed when a short script exits, and the file would never be
+    written.
+    """
+    global _registry
+    if _registry is None:
+        _registry = CoinRegistry(aliases=aliases)
+        if _registry.load():
+            _registry.refresh_in_background()
+        else:
+            print("Downloading coin list (first run only)...")
+            _registry.refresh()
+    elif aliases:
+        _registry.aliases.update({k.lower(): v for k, v in aliases.items()})
+    return _registry
+
+
+if __name__ == "__main__":
+    registry = CoinRegistry()
+    registry.load()
+    print(f"Loaded {len(registry)} coins from {registry.path}")
+    stats = registry.refresh()
+    if stats:
+        print(f"Refreshed: {stats['added']} added, {stats['updated']} updated, {stats['removed']} removed")
+
+    for query in ["btc", "Ethereum", "doge-dogecoin", "etherium", "sol"]:
+        result = registry.check(query)
+        if result["valid"]:
+            print(f"{query!r:>16} -> {result['id']}")
+        else:
+            print(f"{query!r:>16} -> not found, did you mean: {', '.join(result['suggestions'])}")
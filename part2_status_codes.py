@@ -11,6 +11,8 @@ Learn:
 
 import requests
 
+from bulk_fetch import BulkFetcher
+
 print("=== Understanding Status Codes ===\n")
 
 # -----------------------------
@@ -113,3 +115,18 @@ if response_comments.status_code == 200:
     print(f"Post 1 has {len(comments)} comments.")
 else:
     print("Failed to fetch comments.")
+
+# Exercise 4: Count comments on EVERY post without one request per post
+print("\n--- Exercise 4: Comments Count on All Posts ---")
+fetcher = BulkFetcher()
+try:
+    comments_per_post = fetcher.comments_per_post()
+    if comments_per_post:
+        busiest = max(comments_per_post, key=comments_per_post.get)
+        print(f"Counted comments on {len(comments_per_post)} posts.")
+        print(f"Post {busiest} has the most comments: {comments_per_post[busiest]}")
+    else:
+        print("Failed to fetch comments.")
+    print(f"Requests: {fetcher.report()}")
+except requests.RequestException as e:
+    print(f"Failed to fetch comments: {e}")
@@ -12,6 +12,8 @@ Learn:
 
 import requests
 
+from response_cache import cached_get_json
+
 # --- Helper Functions ---
 
 def get_user_info():
@@ -68,10 +70,12 @@ def get_crypto_price():
     coin_id = input("Enter coin ID (e.g., btc-bitcoin): ").lower().strip()
 
     url = f"https://api.coinpaprika.com/v1/tickers/{coin_id}"
-    response = requests.get(url)
+    try:
+        data = cached_get_json(url, ttl=60)  # reuse prices fetched in the last minute
+    except requests.RequestException:
+        data = None
 
-    if response.status_code == 200:
-        data = response.json()
+    if data:
         price_usd = data['quotes']['USD']['price']
         change_24h = data['quotes']['USD']['percent_change_24h']
 
@@ -103,10 +107,12 @@ def get_weather():
 
     lat, lon = cities[city_name]
     url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current_weather=true"
-    response = requests.get(url)
+    try:
+        data = cached_get_json(url, ttl=600)  # reuse weather fetched in the last 10 minutes
+    except requests.RequestException:
+        data = None
 
-    if response.status_code == 200:
-        data = response.json()
+    if data:
         temp = data['current_weather']['temperature']
         wind = data['current_weather']['windspeed']
         print(f"\nCurrent weather in {city_name.title()}:")
@@ -17,6 +17,9 @@ from requests.exceptions import ConnectionError, Timeout, HTTPError, RequestExce
 import time
 import logging
 
+from coin_registry import get_registry
+from schemas import validate_ticker, validate_user
+
 # --- Setup logging ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -96,10 +99,9 @@ def validate_json_response():
     result = safe_api_request(url)
     if result["success"]:
         data = result["data"]
-        required_fields = ["name", "email", "phone"]
-        missing = [f for f in required_fields if f not in data]
-        if missing:
-            print(f"Warning: Missing fields: {missing}")
+        errors = validate_user(data)
+        if errors:
+            print(f"Warning: Invalid response: {errors}")
         else:
             print("All required fields present!")
             print(f"Name: {data['name']}")
@@ -118,20 +120,32 @@ def fetch_crypto_safely():
         print("Error: Please enter a coin name.")
         return
 
+    # Validate the coin locally before spending any retries on it
+    check = get_registry().check(coin)
+    if not check["valid"]:
+        print(f"Error: Unknown coin '{coin}'.")
+        if check["suggestions"]:
+            print(f"Did you mean: {', '.join(check['suggestions'])}?")
+        return
+    coin = check["id"]
+
     url = f"https://api.coinpaprika.com/v1/tickers/{coin}"
     result = safe_api_request(url)
 
     if result["success"]:
         data = result["data"]
-        # Validate response keys
-        if "quotes" in data and "USD" in data["quotes"]:
+        # Validate response keys and types
+        errors = validate_ticker(data)
+        if not errors:
             price_usd = data["quotes"]["USD"]["price"]
             change_24h = data["quotes"]["USD"]["percent_change_24h"]
             print(f"\n{data['name']} ({data['symbol']})")
             print(f"Price: ${price_usd:,.2f}")
             print(f"24h Change: {change_24h:+.2f}%")
         else:
-            print("Error: Unexpected response structure. Missing 'quotes' or 'USD' key.")
+            print("Error: Unexpected response structure:")
+            for error in errors:
+                print(f"  {error}")
     else:
         print(f"\nError: {result['error']}")
         print("Tip: Try 'btc-bitcoin' or 'eth-ethereum'")
@@ -139,6 +153,8 @@ def fetch_crypto_safely():
 
 # --- Main Program ---
 def main():
+    # Load (or download) the coin list now so a stale one can refresh while the demos run
+    get_registry()
     demo_error_handling()
     print("\n" + "=" * 40 + "\n")
     validate_json_response()
@@ -6,9 +6,13 @@ Difficulty: Advanced
 Features:
 - Weather for multiple cities (Open-Meteo)
 - Crypto prices and comparison (CoinPaprika)
+- Coin names checked against a local registry before fetching
 - Top 5 cryptos by market cap
+- Price alerts (crossing a price, big moves within 5 minutes)
 - Save results to JSON
 - POST request example
+- Bulk POST with idempotency keys (results streamed to JSONL)
+- Responses cached on disk and shared between runs
 - Optional API key support for OpenWeatherMap
 """
 
@@ -16,6 +20,12 @@ import requests
 from datetime import datetime
 import json
 import os
+import time
+
+from bulk_post import bulk_post
+from coin_registry import get_registry
+from price_alerts import PriceAlertEngine
+from response_cache import cached_get_json
 
 # ======================
 # City coordinates (latitude, longitude)
@@ -35,6 +45,10 @@ CITIES = {
     "berlin": (52.5200, 13.4050)
 }
 
+# How long cached responses stay fresh (seconds)
+WEATHER_TTL = 10 * 60  # Open-Meteo updates current weather every 15 minutes
+TICKER_TTL = 60        # CoinPaprika updates tickers about once a minute
+
 # ======================
 # Popular cryptocurrencies
 # ======================
@@ -68,9 +82,7 @@ def get_weather(city_name):
     }
 
     try:
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        return response.json()
+        return cached_get_json(url, params=params, ttl=WEATHER_TTL, timeout=10)
     except requests.RequestException as e:
         print(f"Error fetching weather: {e}")
         return None
@@ -107,14 +119,18 @@ def display_weather(city_name):
 # ======================
 def get_crypto_price(coin_name):
     """Fetch crypto price"""
-    coin_lower = coin_name.lower().strip()
-    coin_id = CRYPTO_IDS.get(coin_lower, coin_lower)
+    # Check the name locally first so typos don't cost a request
+    check = get_registry(CRYPTO_IDS).check(coin_name)
+    if not check["valid"]:
+        print(f"\nUnknown coin '{coin_name}'.")
+        if check["suggestions"]:
+            print(f"Did you mean: {', '.join(check['suggestions'])}?")
+        return None
+    coin_id = check["id"]
     url = f"https://api.coinpaprika.com/v1/tickers/{coin_id}"
 
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return response.json()
+        return cached_get_json(url, ttl=TICKER_TTL, timeout=10)
     except requests.RequestException as e:
         print(f"Error fetching crypto data: {e}")
         return None
@@ -123,8 +139,7 @@ def display_crypto(coin_name):
     """Display crypto info"""
     data = get_crypto_price(coin_name)
     if not data:
-        print(f"\nCoin '{coin_name}' not found. Available: {', '.join(CRYPTO_IDS.keys())}")
-        return
+        return  # get_crypto_price already said why
 
     usd = data["quotes"]["USD"]
     print(f"\n{'=' * 40}")
@@ -160,9 +175,7 @@ def get_top_cryptos(limit=5):
     url = "https://api.coinpaprika.com/v1/tickers"
     params = {"limit": limit}
     try:
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        return response.json()
+        return cached_get_json(url, params=params, ttl=TICKER_TTL, timeout=10)
     except requests.RequestException as e:
         print(f"Error: {e}")
         return None
@@ -182,6 +195,57 @@ def display_top_cryptos():
         print(f"  {coin['rank']:<6}{coin['name']:<15}${usd['price']:>12,.2f}  {change:+.2f}%")
     print(f"{'='*55}")
 
+# ======================
+# Price Alerts
+# ======================
+def get_live_tickers():
+    """
+    Fetch every ticker straight from the API.
+
+    Not cached: the full list is several MB and would push weather and
+    single-coin entries out of the cache, and alerts need fresh prices.
+    """
+    try:
+        response = requests.get("https://api.coinpaprika.com/v1/tickers", timeout=10)
+        response.raise_for_status()
+        return response.json()
+    except requests.RequestException as e:
+        print(f"Error: {e}")
+        return None
+
+def watch_price_alerts(engine, polls=10, interval=60):
+    """Poll all tickers and print alerts; each poll is one request for every coin"""
+    print(f"\nWatching {len(engine.rules)} alert rules (Ctrl+C to stop)...")
+    try:
+        for poll in range(1, polls + 1):
+            data = get_live_tickers()
+            if data:
+                for alert in engine.update_from_tickers(data):
+                    print(f"  [{datetime.now().strftime('%H:%M:%S')}] ALERT: {alert['message']}")
+            if poll < polls:
+                time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+def price_alert_example():
+    """Set up alerts for one coin and watch them"""
+    coin = input("Enter crypto name: ")
+    check = get_registry(CRYPTO_IDS).check(coin)
+    if not check["valid"]:
+        print(f"\nCoin '{coin}' not found.")
+        return
+    try:
+        target = float(input("Alert when price crosses ($): ").strip().replace(",", ""))
+    except ValueError:
+        print("Invalid price.")
+        return
+
+    engine = PriceAlertEngine()
+    engine.add_cross_rule(check["id"], target, "above")
+    engine.add_cross_rule(check["id"], target, "below")
+    engine.add_move_rule(check["id"], 1.0, window=5 * 60)
+    watch_price_alerts(engine)
+
 # ======================
 # POST Request Example
 # ======================
@@ -190,7 +254,7 @@ def create_post_example():
     url = "https://jsonplaceholder.typicode.com/posts"
     payload = {"title": "My Post", "body": "This is content", "userId": 1}
     try:
-        response = requests.post(url, json=payload)
+        response = requests.post(url, json=payload, timeout=10)
         response.raise_for_status()
         data = response.json()
         print("\nPOST Request successful! Response:")
@@ -201,6 +265,16 @@ def create_post_example():
     except requests.RequestException as e:
         print(f"Error creating post: {e}")
 
+def bulk_post_example(count=20):
+    """Send many POST requests concurrently, appending results to a JSONL file"""
+    payloads = ({"title": f"Post {i}", "body": "Bulk content", "userId": i % 10 + 1}
+                for i in range(1, count + 1))
+    summary = bulk_post(payloads, sink="post_responses.jsonl")
+    print(f"\nSent {summary['sent']} posts in {summary['seconds']}s")
+    print(f"  Succeeded: {summary['succeeded']}")
+    print(f"  Failed:    {summary['failed']}")
+    print("Responses appended to post_responses.jsonl")
+
 # ======================
 # Save Results to JSON
 # ======================
@@ -226,9 +300,11 @@ def dashboard():
         print("  4. View Top 5 Cryptos")
         print("  5. Quick Dashboard (Delhi + Bitcoin)")
         print("  6. Create Sample POST Request")
-        print("  7. Exit")
+        print("  7. Bulk POST Sample Posts")
+        print("  8. Price Alerts")
+        print("  9. Exit")
 
-        choice = input("\nSelect (1-7): ").strip()
+        choice = input("\nSelect (1-9): ").strip()
 
         if choice == "1":
             print(f"\nAvailable cities: {', '.join(CITIES.keys())}")
@@ -256,6 +332,12 @@ def dashboard():
             create_post_example()
 
         elif choice == "7":
+            bulk_post_example()
+
+        elif choice == "8":
+            price_alert_example()
+
+        elif choice == "9":
             print("\nGoodbye! Happy coding!")
             break
 
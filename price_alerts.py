@@ -0,0 +1,218 @@
+"""
+Price Alerts - Checking Thousands of Rules per Poll
+===================================================
+Used by: part5_real_api.py
+
+Features:
+- "Price crosses X" rules, indexed per coin in sorted threshold lists
+- "Moved more than Y% within N seconds" rules over rolling windows
+- Each tick only looks at the rules whose thresholds the price moved past,
+  plus one rolling-window update per (coin, window), so the cost doesn't
+  grow with the number of rules
+- Rolling min/max per window are kept incrementally (monotonic deques)
+- Each rule fires once per episode and re-arms only after it clears
+"""
+
+import bisect
+import itertools
+import time
+from collections import deque
+
+DIRECTIONS = ("up", "down", "any")
+
+
+class RollingWindow:
+    """Min and max price over the last `seconds`, updated in O(1) amortized."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self._mins = deque()  # (time, price), prices increasing
+        self._maxs = deque()  # (time, price), prices decreasing
+
+    def add(self, now, price):
+        while self._mins and self._mins[-1][1] >= price:
+            self._mins.pop()
+        self._mins.append((now, price))
+        while self._maxs and self._maxs[-1][1] <= price:
+            self._maxs.pop()
+        self._maxs.append((now, price))
+
+        cutoff = now - self.seconds
+        while self._mins[0][0] < cutoff:
+            self._mins.popleft()
+        while self._maxs[0][0] < cutoff:
+            self._maxs.popleft()
+
+    def moves(self, price):
+        """Return (percent up from the low, percent down from the high)."""
+        low = self._mins[0][1]
+        high = self._maxs[0][1]
+        up = (price - low) / low * 100 if low else 0.0
+        down = (high - price) / high * 100 if high else 0.0
+        return up, down
+
+
+class PriceAlertEngine:
+    """Evaluates cross and move rules against a stream of ticker prices."""
+
+    def __init__(self, cooldown=300):
+        self.cooldown = cooldown  # seconds before a cross rule can fire again
+        self.rules = {}           # rule_id -> rule dict
+        self.evaluated = 0        # rules looked at across all ticks
+        self._ids = itertools.count(1)
+        self._last_price = {}     # coin -> price
+        self._last_fired = {}     # cross rule_id -> time it last fired
+        self._cross = {}          # coin -> {"above": [(price, id)], "below": [...]}
+        self._windows = {}        # coin -> {seconds: RollingWindow}
+        self._moves = {}          # (coin, seconds, direction) -> [(percent, id)]
+        self._fired_upto = {}     # same key -> how many of the sorted rules are firing
+
+    # ======================
+    # Rules
+    # ======================
+    def add_cross_rule(self, coin, price, direction="above", rule_id=None):
+        """Fire when coin's price crosses `price` going `direction`."""
+        if direction not in ("above", "below"):
+            raise ValueError("direction must be 'above' or 'below'")
+        rule_id = rule_id or f"rule-{next(self._ids)}"
+        self.rules[rule_id] = {"id": rule_id, "type": "cross", "coin": coin,
+                               "price": price, "direction": direction}
+        index = self._cross.setdefault(coin, {"above": [], "below": []})
+        bisect.insort(index[direction], (price, rule_id))
+        return rule_id
+
+    def add_move_rule(self, coin, percent, window=300, direction="any", rule_id=None):
+        """Fire when coin moves more than `percent` within `window` seconds."""
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {', '.join(DIRECTIONS)}")
+        rule_id = rule_id or f"rule-{next(self._ids)}"
+        self.rules[rule_id] = {"id": rule_id, "type": "move", "coin": coin,
+                               "percent": percent, "window": window, "direction": direction}
+        self._windows.setdefault(coin, {}).setdefault(window, RollingWindow(window))
+        key = (coin, window, direction)
+        rules = self._moves.setdefault(key, [])
+        pos = bisect.bisect_left(rules, (percent, rule_id))
+        rules.insert(pos, (percent, rule_id))
+        # A rule added mid-episode waits for the next one instead of firing late.
+        if pos < self._fired_upto.get(key, 0):
+            self._fired_upto[key] += 1
+        return rule_id
+
+    def remove_rule(self, rule_id):
+        rule = self.rules.pop(rule_id)
+        if rule["type"] == "cross":
+            rules = self._cross[rule["coin"]][rule["direction"]]
+            rules.remove((rule["price"], rule_id))
+            self._last_fired.pop(rule_id, None)
+            return
+        key = (rule["coin"], rule["window"], rule["direction"])
+        rules = self._moves[key]
+        pos = bisect.bisect_left(rules, (rule["percent"], rule_id))
+        del rules[pos]
+        if pos < self._fired_upto.get(key, 0):
+            self._fired_upto[key] -= 1
+
+    # ======================
+    # Ticks
+    # ======================
+    def update(self, coin, price, now=None):
+        """
+        Feed one price for one coin.
+
+        An unchanged price can't cross a threshold, so cross rules are skipped,
+        but it still goes into the rolling windows: it is the baseline that a
+        later move is measured against.
+
+        Returns:
+            list: alert dicts for every rule that fired on this tick
+        """
+        now = time.time() if now is None else now
+        previous = self._last_price.get(coin)
+        self._last_price[coin] = price
+
+        alerts = []
+        if previous is not None and previous != price and coin in self._cross:
+            alerts.extend(self._check_crosses(coin, previous, price, now))
+        for seconds, window in self._windows.get(coin, {}).items():
+            window.add(now, price)
+            alerts.extend(self._check_moves(coin, seconds, window, price, now))
+        return alerts
+
+    def update_from_tickers(self, tickers, now=None):
+        """Feed a CoinPaprika /v1/tickers response (list of ticker dicts)."""
+        now = time.time() if now is None else now
+        alerts = []
+        for ticker in tickers:
+            alerts.extend(self.update(ticker["id"], ticker["quotes"]["USD"]["price"], now))
+        return alerts
+
+    def _check_crosses(self, coin, previous, price, now):
+        index = self._cross[coin]
+        if price > previous:
+            rules = index["above"]
+            # thresholds in (previous, price]
+            lo = bisect.bisect_right(rules, previous, key=_first)
+            hi = bisect.bisect_right(rules, price, key=_first)
+        else:
+            rules = index["below"]
+            # thresholds in [price, previous)
+            lo = bisect.bisect_left(rules, price, key=_first)
+            hi = bisect.bisect_left(rules, previous, key=_first)
+        self.evaluated += hi - lo
+
+        alerts = []
+        for threshold, rule_id in rules[lo:hi]:
+            if now - self._last_fired.get(rule_id, float("-inf")) < self.cooldown:
+                continue
+            self._last_fired[rule_id] = now
+            rule = self.rules[rule_id]
+            alerts.append(_alert(rule, price, now,
+                                 f"{coin} crossed {rule['direction']} ${threshold:,.2f} (now ${price:,.2f})"))
+        return alerts
+
+    def _check_moves(self, coin, seconds, window, price, now):
+        up, down = window.moves(price)
+        alerts = []
+        for direction, move in (("up", up), ("down", down), ("any", max(up, down))):
+            key = (coin, seconds, direction)
+            rules = self._moves.get(key)
+            if not rules:
+                continue
+            # Rules are sorted by percent, so the ones triggered are a prefix.
+            met = bisect.bisect_left(rules, move, key=_first)
+            fired = self._fired_upto.get(key, 0)
+            if met > fired:
+                self.evaluated += met - fired
+                for percent, rule_id in rules[fired:met]:
+                    alerts.append(_alert(self.rules[rule_id], price, now,
+                                         f"{coin} moved {move:.2f}% {direction} within {seconds}s "
+                                         f"(rule > {percent}%)"))
+            self._fired_upto[key] = met  # rules past `met` re-arm
+        return alerts
+
+
+def _first(item):
+    return item[0]
+
+
+def _alert(rule, price, now, message):
+    return {"rule_id": rule["id"], "coin": rule["coin"], "type": rule["type"],
+            "price": price, "time": now, "message": message}
+
+
+if __name__ == "__main__":
+    import random
+
+    engine = PriceAlertEngine()
+    for i in range(5000):
+        engine.add_cross_rule("btc-bitcoin", 60000 + i * 2, random.choice(["above", "below"]))
+        engine.add_move_rule("btc-bitcoin", 0.5 + i / 1000, window=300, direction=random.choice(DIRECTIONS))
+
+    price = 65000.0
+    fired = 0
+    for tick in range(1000):
+        price *= 1 + random.uniform(-0.002, 0.002)
+        fired += len(engine.update("btc-bitcoin", round(price, 2), now=tick * 5))
+
+    print(f"{len(engine.rules)} rules, 1000 ticks: {fired} alerts, "
+          f"{engine.evaluated} rule checks ({engine.evaluated / 1000:.1f} per tick)")
@@ -0,0 +1,297 @@
+"""
+Response Cache - Sharing API Results Between Runs
+=================================================
+Used by: part3_user_input.py, part5_real_api.py
+
+Features:
+- Stores responses in a SQLite file (WAL mode) that several processes can share
+- Keys each entry by method + URL + query parameters
+- Keeps a TTL plus ETag/Last-Modified so stale entries can be revalidated (304)
+- Caps the total size and evicts least recently used entries
+- Compacts in a background thread: drops expired rows and shrinks the file
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+import requests
+
+CACHE_FILE = "api_cache.sqlite3"
+MAX_BYTES = 20 * 1024 * 1024  # 20 MB
+DEFAULT_TTL = 60              # seconds
+COMPACT_EVERY = 300           # seconds between background compactions
+KEEP_STALE = 24 * 60 * 60     # how long expired entries wait to be revalidated
+BUSY_TIMEOUT = 1              # seconds to wait for another process's write lock
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    body TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    created REAL NOT NULL,
+    expires REAL NOT NULL,
+    last_access REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires);
+"""
+
+
+def cache_key(url, params=None, method="GET"):
+    """Same request -> same key, whatever order the params were given in."""
+    query = json.dumps(sorted((params or {}).items()), separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{method} {url} {query}".encode()).hexdigest()
+
+
+class ResponseCache:
+    """Persistent response cache shared safely between processes."""
+
+    def __init__(self, path=CACHE_FILE, max_bytes=MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._compact_thread = None
+        self._stop = threading.Event()
+        self._touched = {}  # key -> last access time, written to disk in batches
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+
+    # ======================
+    # Connections
+    # ======================
+    def _connect(self):
+        """One connection per thread; SQLite handles locking between processes."""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT)
+            # auto_vacuum must be set before the first table is created
+            db.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            db.execute("PRAGMA journal_mode = WAL")
+            db.execute("PRAGMA synchronous = NORMAL")
+            self._local.db = db
+        return db
+
+    # ======================
+    # Reading & Writing
+    # ======================
+    def get(self, key, allow_stale=False):
+        """
+        Look up a cached entry.
+
+        Returns:
+            dict: {"data", "etag", "last_modified", "fresh"} or None
+        """
+        db = self._connect()
+        row = db.execute(
+            "SELECT body, etag, last_modified, expires FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        body, etag, last_modified, expires = row
+        now = time.time()
+        fresh = expires > now
+        if not fresh and not allow_stale:
+            return None
+        # Reads never take the write lock; the LRU time is saved by the next write.
+        self._touched[key] = now
+        return {"data": json.loads(body), "etag": etag, "last_modified": last_modified, "fresh": fresh}
+
+    def put(self, key, url, data, ttl=DEFAULT_TTL, etag=None, last_modified=None):
+        body = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+        now = time.time()
+        db = self._connect()
+        self._flush_touched()
+        with db:
+            db.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, body, etag, last_modified, created, expires, last_access, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, body, etag, last_modified, now, now + ttl, now, len(body.encode())),
+            )
+        self._evict()
+
+    def touch(self, key, ttl=DEFAULT_TTL):
+        """Mark an entry fresh again after the server answered 304."""
+        now = time.time()
+        db = self._connect()
+        with db:
+            db.execute("UPDATE responses SET expires = ?, last_access = ? WHERE key = ?",
+                       (now + ttl, now, key))
+
+    def _flush_touched(self):
+        """Save batched last_access times; best effort, skipped if the database is busy."""
+        if not self._touched:
+            return
+        touched, self._touched = self._touched, {}
+        db = self._connect()
+        try:
+            with db:
+                db.executemany("UPDATE responses SET last_access = ? WHERE key = ?",
+                               [(t, key) for key, t in touched.items()])
+        except sqlite3.OperationalError:
+            pass  # LRU order is only a hint; losing a batch just makes eviction less exact
+
+    def _evict(self):
+        """Delete least recently used entries until under max_bytes."""
+        db = self._connect()
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in db.execute("SELECT key, size FROM responses ORDER BY last_access"):
+            doomed.append((key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+        with db:
+            db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def stats(self):
+        db = self._connect()
+        count, total = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {"entries": count, "bytes": total, "hits": self.hits, "misses": self.misses}
+
+    # ======================
+    # Compaction
+    # ======================
+    def compact(self):
+        """Drop expired rows, return free pages to the OS and trim the WAL."""
+        db = self._connect()
+        self._flush_touched()
+        with db:
+            # Expired entries with validators are kept a while for revalidation.
+            now = time.time()
+            removed = db.execute(
+                "DELETE FROM responses WHERE expires < ? AND "
+                "((etag IS NULL AND last_modified IS NULL) OR expires < ?)",
+                (now, now - KEEP_STALE),
+            ).rowcount
+        # execute() would step the pragma once and free a single page
+        db.executescript("PRAGMA incremental_vacuum")
+        db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return removed
+
+    def compact_in_background(self, every=COMPACT_EVERY):
+        """Start a daemon thread that compacts the cache every few minutes."""
+        if self._compact_thread and self._compact_thread.is_alive():
+            return self._compact_thread
+
+        def loop():
+            while not self._stop.wait(every):
+                try:
+                    self.compact()
+                except sqlite3.Error as e:
+                    print(f"Cache compaction failed: {e}")
+
+        self._compact_thread = threading.Thread(target=loop, daemon=True)
+        self._compact_thread.start()
+        return self._compact_thread
+
+    def close(self):
+        self._stop.set()
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+    # ======================
+    # Cached GET
+    # ======================
+    def get_json(self, url, params=None, ttl=DEFAULT_TTL, timeout=10, session=None):
+        """
+        GET a JSON endpoint, serving it from disk while the entry is fresh.
+
+        Stale entries with an ETag or Last-Modified are revalidated with a
+        conditional request. Raises requests.RequestException like
+        response.raise_for_status() would. If the cache file can't be read or
+        written (locked, read-only, corrupt), the request goes to the network.
+        """
+        key = cache_key(url, params)
+        try:
+            entry = self.get(key, allow_stale=True)
+        except sqlite3.Error as e:
+            print(f"Cache unavailable ({e}), fetching from the network")
+            entry = None
+        if entry and entry["fresh"]:
+            self.hits += 1
+            return entry["data"]
+        self.misses += 1
+
+        headers = {}
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = (session or requests).get(url, params=params, headers=headers, timeout=timeout)
+        if response.status_code == 304 and entry:
+            try:
+                self.touch(key, ttl)
+            except sqlite3.Error as e:
+                print(f"Could not update cache: {e}")
+            return entry["data"]
+        response.raise_for_status()
+        data = response.json()
+        try:
+            self.put(key, response.url, data, ttl,
+                     etag=response.headers.get("ETag"),
+                     last_modified=response.headers.get("Last-Modified"))
+        except sqlite3.Error as e:
+            print(f"Could not update cache: {e}")
+        return data
+
+
+# ======================
+# Shared cache
+# ======================
+_cache = None
+
+
+def get_cache():
+    """
+    Return the shared cache, opening it (and its compactor) on first use.
+
+    Returns None if the cache file can't be opened, e.g. in a read-only directory.
+    """
+    global _cache
+    if _cache is None:
+        try:
+            _cache = ResponseCache()
+        except sqlite3.Error as e:
+            print(f"Cache unavailable ({e}), fetching from the network")
+            return None
+        _cache.compact_in_background()
+    return _cache
+
+
+def cached_get_json(url, params=None, ttl=DEFAULT_TTL, timeout=10):
+    """Shortcut for get_cache().get_json(...), going straight to the network without a cache."""
+    cache = get_cache()
+    if cache is None:
+        response = requests.get(url, params=params, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+    return cache.get_json(url, params=params, ttl=ttl, timeout=timeout)
+
+
+if __name__ == "__main__":
+    url = "https://api.coinpaprika.com/v1/tickers/btc-bitcoin"
+    for attempt in range(1, 3):
+        start = time.perf_counter()
+        try:
+            data = cached_get_json(url, ttl=60)
+        except requests.RequestException as e:
+            print(f"Error: {e}")
+            break
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"Request {attempt}: {data['name']} ${data['quotes']['USD']['price']:,.2f} ({elapsed:.1f} ms)")
+    if get_cache():
+        print(get_cache().stats())
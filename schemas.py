@@ -0,0 +1,195 @@
+"""
+Response Schemas - Fast JSON Validation
+=======================================
+Used by: part4_error_handling.py
+
+Features:
+- Declarative schemas for user, post, ticker and weather responses
+- compile_schema() turns a schema into a validator function once
+- Validators check nested keys and types in one pass
+- Errors name the exact path, e.g. "quotes.USD.price: expected number, got str"
+
+Schema format:
+    {"key": type}             key must exist and be an instance of type
+    {"key": (type1, type2)}   any of several types
+    {"key": {...}}            nested object
+    {"key": [schema]}         list whose items all match schema
+"""
+
+import time
+
+NUMBER = (int, float)
+
+USER_SCHEMA = {
+    "id": int,
+    "name": str,
+    "username": str,
+    "email": str,
+    "phone": str,
+    "address": {"city": str},
+    "company": {"name": str},
+}
+
+POST_SCHEMA = {
+    "id": int,
+    "userId": int,
+    "title": str,
+    "body": str,
+}
+
+TICKER_SCHEMA = {
+    "id": str,
+    "name": str,
+    "symbol": str,
+    "rank": int,
+    "quotes": {
+        "USD": {
+            "price": NUMBER,
+            "volume_24h": NUMBER,
+            "market_cap": NUMBER,
+            "percent_change_1h": NUMBER,
+            "percent_change_24h": NUMBER,
+            "percent_change_7d": NUMBER,
+        },
+    },
+}
+
+WEATHER_SCHEMA = {
+    "latitude": NUMBER,
+    "longitude": NUMBER,
+    "current_weather": {
+        "temperature": NUMBER,
+        "windspeed": NUMBER,
+        "winddirection": NUMBER,
+        "weathercode": int,
+    },
+}
+
+
+# ======================
+# Compiler
+# ======================
+def compile_schema(schema):
+    """
+    Build a validator for a schema.
+
+    Returns:
+        function: validator(data) -> list of error strings ([] means valid)
+    """
+    check = _compile(schema)
+
+    def validator(data):
+        errors = []
+        check(data, "", errors)
+        return errors
+
+    return validator
+
+
+def _compile(schema):
+    if isinstance(schema, dict):
+        return _compile_object(schema)
+    if isinstance(schema, list):
+        return _compile_list(schema[0])
+    return _compile_type(schema)
+
+
+def _compile_type(types):
+    expected = _type_name(types)
+    reject_bool = _rejects_bool(types)
+
+    def check(value, path, errors):
+        if not isinstance(value, types) or (reject_bool and value.__class__ is bool):
+            errors.append(f"{path or '<root>'}: expected {expected}, got {type(value).__name__}")
+
+    return check
+
+
+def _compile_object(schema):
+    # Plain types are checked inline; only nested schemas need a sub-check.
+    fields = []
+    for key, sub in schema.items():
+        if isinstance(sub, (dict, list)):
+            fields.append((key, None, False, _compile(sub)))
+        else:
+            fields.append((key, sub, _rejects_bool(sub), None))
+
+    def check(value, path, errors):
+        if not isinstance(value, dict):
+            errors.append(f"{path or '<root>'}: expected object, got {type(value).__name__}")
+            return
+        prefix = f"{path}." if path else ""
+        for key, types, reject_bool, sub_check in fields:
+            if key not in value:
+                errors.append(f"{prefix}{key}: missing")
+            elif sub_check is not None:
+                sub_check(value[key], prefix + key, errors)
+            elif not isinstance(value[key], types) or (reject_bool and value[key].__class__ is bool):
+                errors.append(f"{prefix}{key}: expected {_type_name(types)}, "
+                              f"got {type(value[key]).__name__}")
+
+    return check
+
+
+def _compile_list(item_schema):
+    item_check = _compile(item_schema)
+
+    def check(value, path, errors):
+        if not isinstance(value, list):
+            errors.append(f"{path or '<root>'}: expected list, got {type(value).__name__}")
+            return
+        for i, item in enumerate(value):
+            item_check(item, f"{path}[{i}]", errors)
+
+    return check
+
+
+def _rejects_bool(types):
+    """bool is a subclass of int, so int/NUMBER must turn it away explicitly."""
+    types = types if isinstance(types, tuple) else (types,)
+    return bool not in types and any(issubclass(bool, t) for t in types)
+
+
+def _type_name(types):
+    if types == NUMBER:
+        return "number"
+    if isinstance(types, tuple):
+        return " or ".join(t.__name__ for t in types)
+    return types.__name__
+
+
+# ======================
+# Ready-made validators
+# ======================
+validate_user = compile_schema(USER_SCHEMA)
+validate_post = compile_schema(POST_SCHEMA)
+validate_ticker = compile_schema(TICKER_SCHEMA)
+validate_tickers = compile_schema([TICKER_SCHEMA])
+validate_weather = compile_schema(WEATHER_SCHEMA)
+
+
+def benchmark(count=50000):
+    """Validate count synthetic tickers and return tickers per second."""
+    ticker = {
+        "id": "btc-bitcoin", "name": "Bitcoin", "symbol": "BTC", "rank": 1,
+        "quotes": {"USD": {
+            "price": 67000.5, "volume_24h": 3.1e10, "market_cap": 1.3e12,
+            "percent_change_1h": 0.1, "percent_change_24h": -1.2, "percent_change_7d": 4.5,
+        }},
+    }
+    tickers = [ticker] * count
+    start = time.perf_counter()
+    errors = validate_tickers(tickers)
+    elapsed = time.perf_counter() - start
+    assert not errors, errors[:3]
+    return count / elapsed
+
+
+if __name__ == "__main__":
+    bad = {"id": "btc-bitcoin", "name": "Bitcoin", "symbol": "BTC", "rank": "1",
+           "quotes": {"USD": {"price": "67000"}}}
+    print("Errors for a broken ticker:")
+    for error in validate_ticker(bad):
+        print(f"  {error}")
+
+    print(f"\nValidated {benchmark():,.0f} tickers per second")
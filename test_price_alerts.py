@@ -0,0 +1,39 @@
+"""Tests for price_alerts.py (run with: python -m pytest)"""
+
+from price_alerts import PriceAlertEngine
+
+
+def feed(engine, ticks, coin="btc-bitcoin"):
+    alerts = []
+    for now, price in ticks:
+        alerts.extend(engine.update(coin, price, now=now))
+    return alerts
+
+
+def test_move_after_flat_stretch_fires():
+    # Flat at 100 for 6 minutes, polled every minute, then a 5% drop.
+    engine = PriceAlertEngine()
+    rule_id = engine.add_move_rule("btc-bitcoin", 2, window=300, direction="down")
+    ticks = [(t, 100.0) for t in range(0, 361, 60)] + [(420, 95.0)]
+
+    alerts = feed(engine, ticks)
+
+    assert [a["rule_id"] for a in alerts] == [rule_id]
+    assert alerts[0]["time"] == 420
+
+
+def test_move_fires_once_per_episode():
+    engine = PriceAlertEngine()
+    engine.add_move_rule("btc-bitcoin", 2, window=300, direction="down")
+    ticks = [(0, 100.0), (60, 95.0), (120, 95.0), (180, 94.0)]
+
+    assert len(feed(engine, ticks)) == 1
+
+
+def test_unchanged_price_does_not_cross():
+    engine = PriceAlertEngine()
+    engine.add_cross_rule("btc-bitcoin", 100, "above")
+
+    alerts = feed(engine, [(0, 99.0), (60, 101.0), (120, 101.0)])
+
+    assert len(alerts) == 1
@@ -0,0 +1,129 @@
+"""Tests for response_cache.py (run with: python -m pytest)"""
+
+import os
+import time
+
+import requests
+
+import response_cache
+from response_cache import ResponseCache, cache_key
+
+
+class FakeResponse:
+    def __init__(self, status_code, data=None, headers=None):
+        self.status_code = status_code
+        self.data = data
+        self.headers = headers or {}
+        self.url = "https://example.com/api"
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code}")
+
+    def json(self):
+        return self.data
+
+
+class FakeSession:
+    """Answers every GET with the next queued response and records the headers."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls.append(headers)
+        return self.responses.pop(0)
+
+
+def test_fresh_entry_is_served_from_disk(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    session = FakeSession(FakeResponse(200, {"price": 1}))
+    ResponseCache(path).get_json("https://example.com/api", ttl=60, session=session)
+
+    # A new cache on the same file, like a second process, doesn't hit the network.
+    data = ResponseCache(path).get_json("https://example.com/api", ttl=60, session=FakeSession())
+
+    assert data == {"price": 1}
+    assert len(session.calls) == 1
+
+
+def test_expired_entry_is_revalidated_with_etag(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    session = FakeSession(FakeResponse(200, {"price": 1}, {"ETag": '"v1"'}),
+                          FakeResponse(304))
+    cache.get_json("https://example.com/api", ttl=0, session=session)
+
+    data = cache.get_json("https://example.com/api", ttl=60, session=session)
+
+    assert data == {"price": 1}
+    assert session.calls[1] == {"If-None-Match": '"v1"'}
+    assert cache.get(cache_key("https://example.com/api"))["fresh"]
+
+
+def test_expired_entry_without_validators_is_refetched(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    session = FakeSession(FakeResponse(200, {"price": 1}), FakeResponse(200, {"price": 2}))
+    cache.get_json("https://example.com/api", ttl=0, session=session)
+
+    assert cache.get(cache_key("https://example.com/api")) is None
+    assert cache.get_json("https://example.com/api", ttl=60, session=session) == {"price": 2}
+
+
+def test_eviction_keeps_total_under_max_bytes(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"), max_bytes=4000)
+    for i in range(3):  # about 1 KB each, all three fit
+        cache.put(f"key-{i}", "u", {"body": "x" * 1000})
+        time.sleep(0.01)
+    cache.get("key-0")  # oldest, but recently used, so it should survive
+
+    cache.put("key-3", "u", {"body": "x" * 1000})
+
+    assert cache.stats()["bytes"] <= 4000
+    assert cache.get("key-1") is None
+    assert cache.get("key-0") is not None
+    assert cache.get("key-3") is not None
+
+
+def test_size_counts_bytes_not_characters(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    cache.put("key", "u", {"v": "é" * 10})
+
+    assert cache.stats()["bytes"] == len('{"v":"éééééééééé"}'.encode())
+
+
+def test_compact_removes_expired_rows_and_shrinks_file(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResponseCache(path)
+    for i in range(500):
+        cache.put(f"key-{i}", "u", {"body": "x" * 5000}, ttl=-1)
+    cache.compact()  # checkpoint so the rows are in the main file
+    for i in range(500):
+        cache.put(f"key-{i}", "u", {"body": "x" * 5000}, ttl=-1)
+    big = os.path.getsize(path)
+
+    removed = cache.compact()
+
+    free_pages = cache._connect().execute("PRAGMA freelist_count").fetchone()[0]
+    assert removed == 500
+    assert free_pages == 0
+    assert os.path.getsize(path) < big / 10
+
+
+def test_sqlite_errors_fall_back_to_network(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    cache._connect().close()  # every later query raises sqlite3.ProgrammingError
+    session = FakeSession(FakeResponse(200, {"price": 1}))
+
+    assert cache.get_json("https://example.com/api", session=session) == {"price": 1}
+
+
+def test_unopenable_cache_falls_back_to_network(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.mkdir(response_cache.CACHE_FILE)  # a directory where the cache file should be
+    monkeypatch.setattr(response_cache, "_cache", None)
+    monkeypatch.setattr(response_cache.requests, "get",
+                        lambda url, params=None, timeout=None: FakeResponse(200, {"price": 1}))
+
+    assert response_cache.get_cache() is None
+    assert response_cache.cached_get_json("https://example.com/api") == {"price": 1}